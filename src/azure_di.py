@@ -2,69 +2,90 @@
 """
 Azure AI Document Intelligence client — local PDF files only.
 
-NOTE: Full text extraction is handled by src/pdf_extractor.py (pypdf),
+NOTE: Full text extraction is handled by src/pdf_extractor.py (PyMuPDF, else pypdf),
 not by DI paragraphs. This module is used only for KV pair detection
 from the structured first pages.
 """
 
-import os
-from typing import Optional
+from __future__ import annotations
 
-from azure.core.credentials import AzureKeyCredential
-from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import (
-    AnalyzeResult,
-   # AnalyzeDocumentRequest,
-    DocumentAnalysisFeature
-)
+import functools
+import logging
+import os
+from typing import TYPE_CHECKING, Optional
 
 from src.config import DI_ENDPOINT, DI_KEY, DI_MODEL
 
+log = logging.getLogger(__name__)
+
+# The Azure SDK is slow to import (pydantic-style model registry), so it is
+# only loaded inside the functions that talk to the service
+if TYPE_CHECKING:
+    from azure.core.polling import LROPoller
+    from azure.ai.documentintelligence import DocumentIntelligenceClient
+    from azure.ai.documentintelligence.models import AnalyzeResult
+
 
+@functools.lru_cache(maxsize=1)
 def get_di_client() -> DocumentIntelligenceClient:
+    """
+    Shared DI client — built once so every PDF reuses the same HTTP transport
+    and its keep-alive connection pool. Safe across threads: each
+    begin_analyze_document call gets its own poller.
+    """
     if not DI_ENDPOINT or not DI_KEY:
         raise ValueError(
             "Missing Azure DI credentials.\n"
             "Set DOCUMENT_INTELLIGENCE_ENDPOINT and DOCUMENT_INTELLIGENCE_KEY in .env"
         )
+    from azure.core.credentials import AzureKeyCredential
+    from azure.ai.documentintelligence import DocumentIntelligenceClient
+
     return DocumentIntelligenceClient(
         endpoint=DI_ENDPOINT,
         credential=AzureKeyCredential(DI_KEY),
     )
 
 
-def analyze_pdf(
+def submit_pdf(
     pdf_path: str,
     model_id: Optional[str] = None,
-) -> AnalyzeResult:
+) -> LROPoller[AnalyzeResult]:
     """
-    Analyze a PDF with Azure Document Intelligence.
-    Returns AnalyzeResult used only for KV pairs and table structure.
-    Full text comes from src/pdf_extractor.py instead.
+    Start DI analysis of a PDF and return the poller without waiting on it.
+    Lets callers put several documents in flight before collecting any.
     """
     if not os.path.isfile(pdf_path):
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
     model_id = model_id or DI_MODEL
-    print(f"\n-> Azure DI  |  {os.path.basename(pdf_path)}  "
+    log.info(f"-> Azure DI  |  {os.path.basename(pdf_path)}  "
           f"({os.path.getsize(pdf_path) / 1024:.0f} KB)  |  model={model_id}")
 
-    client = get_di_client()
+    from azure.ai.documentintelligence.models import DocumentAnalysisFeature
 
-    with open(pdf_path, "rb") as f:
-        pdf_bytes = f.read()
+    client = get_di_client()
 
     try:
-        poller = client.begin_analyze_document(
-            model_id=model_id,
-            body=pdf_bytes,
-            features=[DocumentAnalysisFeature.KEY_VALUE_PAIRS],
-        )
+        # Stream the file handle as the request body rather than reading the
+        # whole PDF into memory first; the upload completes inside begin_*
+        with open(pdf_path, "rb") as f:
+            return client.begin_analyze_document(
+                model_id=model_id,
+                body=f,
+                features=[DocumentAnalysisFeature.KEY_VALUE_PAIRS],
+            )
+    except Exception as e:
+        raise RuntimeError(f"Document Intelligence analysis failed: {e}") from e
 
-        print("-> Waiting for result...")
+
+def collect_result(poller: LROPoller[AnalyzeResult]) -> AnalyzeResult:
+    """Block until a poller from submit_pdf() finishes and return its result."""
+    try:
+        log.info("-> Waiting for result...")
         result: AnalyzeResult = poller.result()
 
-        print(f"-> Done  |  pages={len(result.pages or [])}  "
+        log.info(f"-> Done  |  pages={len(result.pages or [])}  "
               f"kv={len(result.key_value_pairs or [])}  "
               f"tables={len(result.tables or [])}")
 
@@ -74,7 +95,20 @@ def analyze_pdf(
         raise RuntimeError(f"Document Intelligence analysis failed: {e}") from e
 
 
+def analyze_pdf(
+    pdf_path: str,
+    model_id: Optional[str] = None,
+) -> AnalyzeResult:
+    """
+    Analyze a PDF with Azure Document Intelligence.
+    Returns AnalyzeResult used only for KV pairs and table structure.
+    Full text comes from src/pdf_extractor.py instead.
+    """
+    return collect_result(submit_pdf(pdf_path, model_id))
+
+
 if __name__ == "__main__":
     import sys
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     r = analyze_pdf(sys.argv[1] if len(sys.argv) > 1 else "Sample.pdf")
     print(f"Pages: {len(r.pages or [])}  KV: {len(r.key_value_pairs or [])}")
\ No newline at end of file
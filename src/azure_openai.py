@@ -4,14 +4,24 @@ Azure OpenAI client for structured JSON extraction from noisy work order text.
 Uses a system prompt + user prompt split for better instruction following.
 """
 
-from openai import AzureOpenAI
+import functools
+
 from src.config import OPENAI_ENDPOINT, OPENAI_KEY, OPENAI_DEPLOYMENT, OPENAI_API_VERSION
 
-client = AzureOpenAI(
-    azure_endpoint=OPENAI_ENDPOINT,
-    api_key=OPENAI_KEY,
-    api_version=OPENAI_API_VERSION,
-)
+
+@functools.lru_cache(maxsize=1)
+def get_openai_client():
+    """
+    Shared AzureOpenAI client, created on first use. The openai package is
+    imported here so runs that never reach the LLM don't pay for it.
+    """
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(
+        azure_endpoint=OPENAI_ENDPOINT,
+        api_key=OPENAI_KEY,
+        api_version=OPENAI_API_VERSION,
+    )
 
 SYSTEM_PROMPT = """You are an expert data extractor specializing in Indian coal transportation
 work orders issued by large steel/mining companies. These documents are scanned PDFs with
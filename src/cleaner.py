@@ -24,12 +24,33 @@ _LETTER_SPACED_WORDS = [
     (r'\bL\s+I\s+F\s+T\s+I\s+N\s+G\b', 'LIFTING'),
 ]
 
+# All words fused into one alternation so the text is scanned once; group N
+# matches _LETTER_SPACED_WORDS[N-1] (earlier entries win, as with sequential subs)
+_RE_LETTER_SPACED = re.compile('|'.join(f'({p})' for p, _ in _LETTER_SPACED_WORDS), re.I)
+_LETTER_SPACED_REPL = [r for _, r in _LETTER_SPACED_WORDS]
+
+# Compiled once at import — these run on every line of the document
+_RE_WS         = re.compile(r'\s+')
+_RE_WS2        = re.compile(r'\s{2,}')
+_RE_HASH_MULTI = re.compile(r'#{2,}')
+_RE_HASH_LONE  = re.compile(r'\s#\s')
+_RE_COLON_DASH = re.compile(r'\s*:-\s*')
+_RE_ANGLE      = re.compile(r'<\s*([^>]+?)\s*>')
+
+# Page header/footer lines: "Page : N [of M]", "Order Continuation Sheet", bare "Order No."
+_RE_DROPLINE = re.compile(
+    r'^(?:Page\s*:\s*\d+\s*(?:of\s*\d+)?|Order\s+Continuation\s+Sheet|Order\s+No\.?)\s*$',
+    re.I
+)
+
+
+def _tidy_placeholder(m: re.Match) -> str:
+    return f"<{m.group(1).strip()}>"
+
 
 def fix_letter_spacing(text: str) -> str:
     """Fix only known letter-spaced words — does NOT blindly join all single letters."""
-    for pattern, replacement in _LETTER_SPACED_WORDS:
-        text = re.sub(pattern, replacement, text, flags=re.I)
-    return text
+    return _RE_LETTER_SPACED.sub(lambda m: _LETTER_SPACED_REPL[m.lastindex - 1], text)
 
 
 def clean_text(text: str | None) -> str:
@@ -43,20 +64,20 @@ def clean_text(text: str | None) -> str:
     text = text.strip()
 
     # Collapse multiple whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _RE_WS.sub(' ', text)
 
     # Fix known letter-spaced words first (targeted, not greedy)
     text = fix_letter_spacing(text)
 
     # Remove repeated hash noise (### or # # #) but preserve single # used as bullet
-    text = re.sub(r'#{2,}', '', text)
-    text = re.sub(r'\s#\s', ' ', text)  # lone # used as separator
+    text = _RE_HASH_MULTI.sub('', text)
+    text = _RE_HASH_LONE.sub(' ', text)  # lone # used as separator
 
     # Normalize label separators: ":-" or ":- " → ": "
-    text = re.sub(r'\s*:-\s*', ': ', text)
+    text = _RE_COLON_DASH.sub(': ', text)
 
     # Keep placeholders readable: < VENDOR NAME > → <VENDOR NAME>
-    text = re.sub(r'<\s*([^>]+?)\s*>', lambda m: f"<{m.group(1).strip()}>", text)
+    text = _RE_ANGLE.sub(_tidy_placeholder, text)
 
     # Strip trailing/leading noise characters
     text = text.strip(' .,:;-#*')
@@ -71,12 +92,17 @@ def clean_raw_paragraph(text: str) -> str:
     """
     if not text:
         return ""
-    text = re.sub(r'\s+', ' ', text.strip())
+    text = _RE_WS.sub(' ', text.strip())
     text = fix_letter_spacing(text)
-    text = re.sub(r'#{2,}', '', text)
-    text = re.sub(r'\s#\s', ' ', text)
-    text = re.sub(r'\s*:-\s*', ': ', text)
-    text = re.sub(r'<\s*([^>]+?)\s*>', lambda m: f"<{m.group(1).strip()}>", text)
+    # Each pass below needs a specific character to match anything, so a
+    # C-level substring test lets most text skip the regex engine entirely
+    if '#' in text:
+        text = _RE_HASH_MULTI.sub('', text)
+        text = _RE_HASH_LONE.sub(' ', text)
+    if ':-' in text:
+        text = _RE_COLON_DASH.sub(': ', text)
+    if '<' in text:
+        text = _RE_ANGLE.sub(_tidy_placeholder, text)
     return text.strip()
 
 
@@ -93,22 +119,17 @@ def clean_full_document_text(raw_text: str) -> str:
 
     for line in lines:
         line = line.strip()
-        if not line:
+        # Drop very short noise (single chars, just numbers, just symbols) —
+        # cheap length test first, none of the header/footer lines are this short
+        if len(line) < 4:
             continue
         # Drop page header/footer lines
-        if re.match(r'^Page\s*:\s*\d+\s*(of\s*\d+)?$', line, re.I):
-            continue
-        if re.match(r'^Order\s+Continuation\s+Sheet\s*$', line, re.I):
-            continue
-        if re.match(r'^Order\s+No\.?\s*$', line, re.I):
-            continue
-        # Drop very short noise (single chars, just numbers, just symbols)
-        if len(line) < 4:
+        if _RE_DROPLINE.match(line):
             continue
         cleaned_lines.append(clean_raw_paragraph(line))
 
     full_clean = ' '.join(cleaned_lines)
-    full_clean = re.sub(r'\s{2,}', ' ', full_clean)
+    full_clean = _RE_WS2.sub(' ', full_clean)
     return full_clean.strip()
 
 
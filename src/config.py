@@ -47,6 +47,13 @@ LLM_CONFIDENCE_THRESHOLD = float(os.getenv("LLM_CONFIDENCE_THRESHOLD", "0.75"))
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output/extracted")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# PDFs processed in parallel by process_folder (DI calls are network-bound)
+DI_CONCURRENCY = int(os.getenv("DI_CONCURRENCY", "8"))
+
+# Reuse extraction results for byte-identical PDFs (see src/extraction_cache.py)
+EXTRACTION_CACHE = os.getenv("EXTRACTION_CACHE", "false").lower() in ("true", "1", "yes")
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", str(Path.home() / ".cache" / "ey_wo"))
+
 # ────────────────────────────────────────────────
 # Configuration validation (optional – call from main.py if needed)
 # ────────────────────────────────────────────────
@@ -84,6 +91,8 @@ def validate_config(print_details: bool = True) -> bool:
         print(f"  • USE_LLM_FALLBACK          = {USE_LLM_FALLBACK}")
         print(f"  • LLM_CONFIDENCE_THRESHOLD = {LLM_CONFIDENCE_THRESHOLD}")
         print(f"  • OUTPUT_DIR                = {OUTPUT_DIR}")
+        print(f"  • DI_CONCURRENCY            = {DI_CONCURRENCY}")
+        print(f"  • EXTRACTION_CACHE          = {EXTRACTION_CACHE}")
 
     return True
 
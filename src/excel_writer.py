@@ -0,0 +1,259 @@
+# src/excel_writer.py
+"""
+Formatted multi-sheet Excel output for extracted work order data.
+
+Kept out of main.py so openpyxl is only imported once a run actually reaches
+the save step (main.process_pdf imports this module lazily).
+"""
+
+import functools
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from src.config import OUTPUT_DIR
+
+log = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────────────────────
+# Excel formatting helpers
+# ─────────────────────────────────────────────────────────────
+
+_DARK_BLUE  = "1F3864"
+_MID_BLUE   = "2E5FAA"
+_LIGHT_GRAY = "F5F5F5"
+_WHITE      = "FFFFFF"
+_GREEN_BG   = "E2EFDA"
+_GREEN_FG   = "375623"
+
+
+def _hdr_font():
+    return Font(name="Arial", bold=True, color=_WHITE, size=10)
+
+# Cached: openpyxl style objects are shareable across cells, so one instance
+# per distinct argument tuple is enough
+@functools.lru_cache(maxsize=128)
+def _body_font(bold=False, color="000000", italic=False):
+    return Font(name="Arial", bold=bold, color=color, size=10, italic=italic)
+
+@functools.lru_cache(maxsize=128)
+def _fill(hex_color):
+    return PatternFill("solid", fgColor=hex_color)
+
+
+# Style palette — built once at import and shared by reference across cells.
+_ALIGN_CENTER   = Alignment(horizontal="center", vertical="center")
+_ALIGN_WRAP     = Alignment(horizontal="left", vertical="center", wrap_text=True)
+_ALIGN_TOP_WRAP = Alignment(horizontal="left", vertical="top", wrap_text=True)
+_BORDER_SIDE    = Side(style="thin", color="D0D0D0")
+_BORDER         = Border(top=_BORDER_SIDE, bottom=_BORDER_SIDE, left=_BORDER_SIDE, right=_BORDER_SIDE)
+
+# Named cell styles: one `cell.style = name` assignment sets font, fill,
+# alignment and border together. Definitions are (font, fill, alignment, border).
+_HDR_STYLE      = "wo_header"
+_BODY_STYLE     = "wo_body"
+_BODY_ALT_STYLE = "wo_body_alt"
+_GREEN_STYLE    = "wo_green"
+
+_STYLE_DEFS = {
+    _HDR_STYLE:      (_hdr_font(), _fill(_DARK_BLUE), _ALIGN_CENTER, _BORDER),
+    _BODY_STYLE:     (_body_font(), _fill(_WHITE), _ALIGN_WRAP, _BORDER),
+    _BODY_ALT_STYLE: (_body_font(), _fill(_LIGHT_GRAY), _ALIGN_WRAP, _BORDER),
+    _GREEN_STYLE:    (_body_font(bold=True, color=_GREEN_FG), _fill(_GREEN_BG), _ALIGN_WRAP, _BORDER),
+}
+
+_BANNER_FONT = Font(name="Arial", bold=True, size=13, color=_WHITE)
+_BANNER_FILL = _fill(_MID_BLUE)
+_LABEL_FONT  = _body_font(bold=True)
+_EMPTY_FONT  = _body_font(italic=True, color="888888")
+
+
+def _add_named_styles(wb: Workbook):
+    # A NamedStyle binds to the workbook it is added to, so each workbook gets
+    # its own instances (workbooks may be written concurrently by process_folder)
+    for name, (font, fill, alignment, border) in _STYLE_DEFS.items():
+        wb.add_named_style(NamedStyle(name=name, font=font, fill=fill, alignment=alignment, border=border))
+
+def _styled_cell(ws, value, style: str) -> WriteOnlyCell:
+    c = WriteOnlyCell(ws, value=value)
+    c.style = style
+    return c
+
+# The workbook is write-only: rows are streamed out as they are appended, so
+# a row's height must be set before it is appended, and column widths /
+# freeze panes before the first row of the sheet.
+
+def _apply_header_row(ws, row: int, headers: list | tuple):
+    ws.row_dimensions[row].height = 20
+    ws.append([_styled_cell(ws, h, _HDR_STYLE) for h in headers])
+
+def _data_row(ws, values: list, alt: bool = False) -> list:
+    """Styled cells for one body row — adjust individual cells, then ws.append()."""
+    style = _BODY_ALT_STYLE if alt else _BODY_STYLE
+    # values are nearly always str already — only coerce the odd None/number
+    return [
+        _styled_cell(ws, v if isinstance(v, str) else ("" if v is None else str(v)), style)
+        for v in values
+    ]
+
+def _sheet_banner(ws, title: str, num_cols: int):
+    ws.row_dimensions[1].height = 30
+    ws.merged_cells.add(f"A1:{get_column_letter(num_cols)}1")
+    c = WriteOnlyCell(ws, value=title)
+    c.font      = _BANNER_FONT
+    c.fill      = _BANNER_FILL
+    c.alignment = _ALIGN_CENTER
+    ws.append([c])
+
+def _set_col_widths(ws, widths: list):
+    for i, w in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = w
+
+
+# ─────────────────────────────────────────────────────────────
+# Sheet writers
+# ─────────────────────────────────────────────────────────────
+
+# Fixed column order for the list-of-dict sheets (also the dict keys)
+_SERVICE_COLS = ("Sr No", "SrvLnNo", "SrvNo", "Brief Description", "Long Text", "Rate", "Unit")
+_CO_COLS      = ("C/O Date", "Amendment Type", "Description", "New Validity", "Ceiling Change")
+
+
+def _write_header_sheet(wb: Workbook, header: dict):
+    ws = wb.create_sheet("Header")
+    ws.sheet_view.showGridLines = False
+    _set_col_widths(ws, [32, 55])
+    ws.freeze_panes = "A3"
+    _sheet_banner(ws, "Work Order — Header Information", 2)
+    _apply_header_row(ws, 2, ["Field", "Value"])
+    for i, (field, value) in enumerate(header.items()):
+        r = 3 + i
+        ws.row_dimensions[r].height = 20
+        cells = _data_row(ws, [field, value], alt=i % 2 == 0)
+        cells[0].font = _LABEL_FONT
+        ws.append(cells)
+
+
+def _write_services_sheet(wb: Workbook, services: list):
+    ws = wb.create_sheet("Services")
+    ws.sheet_view.showGridLines = False
+    _set_col_widths(ws, [8, 10, 14, 30, 65, 10, 22])
+    ws.freeze_panes = "A3"
+    _sheet_banner(ws, "Service Line Items", len(_SERVICE_COLS))
+    _apply_header_row(ws, 2, _SERVICE_COLS)
+    for i, svc in enumerate(services):
+        r = 3 + i
+        ws.row_dimensions[r].height = 60
+        # missing keys come back as None, which _data_row writes as ""
+        ws.append(_data_row(ws, list(map(svc.get, _SERVICE_COLS)), alt=i % 2 == 0))
+
+
+def _write_pricing_sheet(wb: Workbook, pricing: dict):
+    ws = wb.create_sheet("Pricing")
+    ws.sheet_view.showGridLines = False
+    _set_col_widths(ws, [32, 40])
+    ws.freeze_panes = "A3"
+    _sheet_banner(ws, "Pricing & Rate Information", 2)
+    _apply_header_row(ws, 2, ["Field", "Value"])
+    for i, (field, value) in enumerate(pricing.items()):
+        r = 3 + i
+        ws.row_dimensions[r].height = 20
+        cells = _data_row(ws, [field, value], alt=i % 2 == 0)
+        cells[0].font = _LABEL_FONT
+        if any(x in field.lower() for x in ["price", "rate", "ceiling", "value"]):
+            cells[1].style = _GREEN_STYLE
+        ws.append(cells)
+
+
+def _write_text_blocks_sheet(wb: Workbook, text_blocks: dict):
+    ws = wb.create_sheet("Text Blocks")
+    ws.sheet_view.showGridLines = False
+    _set_col_widths(ws, [28, 120])
+    ws.freeze_panes = "A3"
+    _sheet_banner(ws, "Extracted Text Blocks", 2)
+    _apply_header_row(ws, 2, ["Section", "Content"])
+    for i, (section, content) in enumerate(text_blocks.items()):
+        r = 3 + i
+        ws.row_dimensions[r].height = 80
+        cells = _data_row(ws, [section, content], alt=i % 2 == 0)
+        cells[0].font = _LABEL_FONT
+        cells[1].alignment = _ALIGN_TOP_WRAP
+        ws.append(cells)
+
+
+def _write_change_orders_sheet(wb: Workbook, change_orders: list):
+    ws = wb.create_sheet("Change Orders")
+    ws.sheet_view.showGridLines = False
+    _set_col_widths(ws, [14, 22, 80, 16, 20])
+    ws.freeze_panes = "A3"
+    _sheet_banner(ws, "Contract Change Orders (Amendments)", len(_CO_COLS))
+    _apply_header_row(ws, 2, _CO_COLS)
+    if not change_orders:
+        c = WriteOnlyCell(ws, value="No change orders found in document")
+        c.font = _EMPTY_FONT
+        ws.append([c])
+    else:
+        for i, co in enumerate(change_orders):
+            r = 3 + i
+            ws.row_dimensions[r].height = 45
+            ws.append(_data_row(ws, list(map(co.get, _CO_COLS)), alt=i % 2 == 0))
+
+
+def _write_metadata_sheet(wb: Workbook, metadata: dict, pdf_path: str):
+    ws = wb.create_sheet("Metadata")
+    ws.sheet_view.showGridLines = False
+    _set_col_widths(ws, [28, 50])
+    _sheet_banner(ws, "Extraction Metadata", 2)
+    _apply_header_row(ws, 2, ["Property", "Value"])
+    rows = [
+        ("Source PDF",      os.path.basename(pdf_path)),
+        ("Extraction Time", metadata.get("extracted_at", "")),
+        ("From Cache",      f"Yes — extracted {metadata['cached_at']}" if metadata.get("cached_at") else "No"),
+        ("DI Model",        metadata.get("model", "")),
+        ("Pages Analyzed",  str(metadata.get("pages", ""))),
+        ("Paragraphs",      str(metadata.get("paragraphs", ""))),
+        ("KV Pairs Found",  str(metadata.get("kv_pairs", ""))),
+        ("Tables Found",    str(metadata.get("tables", ""))),
+        ("LLM Gap-fill",    metadata.get("llm_gap_fill", "")),
+    ]
+    for i, (k, v) in enumerate(rows):
+        r = 3 + i
+        ws.row_dimensions[r].height = 20
+        cells = _data_row(ws, [k, v], alt=i % 2 == 0)
+        cells[0].font = _LABEL_FONT
+        ws.append(cells)
+
+
+# ─────────────────────────────────────────────────────────────
+# Save to Excel
+# ─────────────────────────────────────────────────────────────
+
+def save_to_excel(data: dict, pdf_path: str, timestamp: Optional[str] = None) -> str:
+    """Write the workbook; `timestamp` (YYYYmmdd_HHMMSS) defaults to now."""
+    base      = Path(pdf_path).stem
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_path  = os.path.join(OUTPUT_DIR, f"{base}_extracted_{timestamp}.xlsx")
+
+    # write_only streams each sheet's rows to disk instead of keeping a
+    # Cell object per value in memory until save()
+    wb = Workbook(write_only=True)
+    _add_named_styles(wb)
+
+    _write_header_sheet(wb,        data.get("header", {}))
+    _write_services_sheet(wb,      data.get("services", []))
+    _write_pricing_sheet(wb,       data.get("pricing", {}))
+    _write_text_blocks_sheet(wb,   data.get("text_blocks", {}))
+    _write_change_orders_sheet(wb, data.get("change_orders", []))
+    _write_metadata_sheet(wb,      data.get("metadata", {}), pdf_path)
+
+    wb.save(out_path)
+    log.info(f"✓ Excel saved: {out_path}")
+    return out_path
@@ -0,0 +1,73 @@
+# src/extraction_cache.py
+"""
+On-disk cache of extract_workorder() results, keyed by PDF content.
+
+Re-running the pipeline on a PDF it has already seen (batch retries, tweaking
+the Excel layout) skips the Azure DI call and all rule extraction. The key is
+the SHA-256 of the PDF bytes plus the DI model and the text backend (PyMuPDF
+and pypdf lay some text out differently), so a renamed copy still hits and a
+changed file never does.
+
+Entries do NOT track the extraction code — clear the cache directory after
+changing the rules. Disabled unless EXTRACTION_CACHE=true.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.config import DI_MODEL, EXTRACTION_CACHE_DIR
+from src.pdf_extractor import text_backend
+
+log = logging.getLogger(__name__)
+
+
+def cache_key(pdf_path: str) -> str:
+    with open(pdf_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return f"{digest}-{DI_MODEL}-{text_backend()}"
+
+
+def _entry_path(key: str) -> Path:
+    return Path(EXTRACTION_CACHE_DIR) / f"{key}.json"
+
+
+def is_cached(key: str) -> bool:
+    return _entry_path(key).is_file()
+
+
+def load_extraction(key: str) -> Optional[Dict[str, Any]]:
+    """Cached extract_workorder() result, or None on a miss or unreadable entry."""
+    try:
+        with open(_entry_path(key), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Valid JSON of the wrong shape (hand-edited, foreign file) is a miss too
+    if not isinstance(data, dict) or not isinstance(data.get("metadata"), dict):
+        return None
+    return data
+
+
+def save_extraction(key: str, data: Dict[str, Any]) -> None:
+    """
+    Best effort: the cache is only a speed-up, so a failed write (read-only
+    or full disk, bad EXTRACTION_CACHE_DIR) is logged and the run carries on.
+    """
+    path = _entry_path(key)
+    # Write-then-rename so a concurrent reader never sees half an entry
+    tmp = path.with_suffix(f".{os.getpid()}.{id(data)}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        log.warning(f"  ⚠ Extraction cache not written: {e}")
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
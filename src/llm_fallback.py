@@ -6,22 +6,30 @@ Merges LLM output carefully — never overwrites confident rule-based values.
 """
 
 import json
-import re
-from typing import Any, Dict
+import logging
+from typing import Any, Callable, Dict, Optional
 
-from src.azure_openai import client, OPENAI_DEPLOYMENT, EXTRACTION_PROMPT, SYSTEM_PROMPT
+from src.azure_openai import get_openai_client, OPENAI_DEPLOYMENT, EXTRACTION_PROMPT, SYSTEM_PROMPT
 from src.cleaner import clean_full_document_text
 
+log = logging.getLogger(__name__)
+
+# orjson is an optional faster drop-in; its JSONDecodeError subclasses json's
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # Fields considered "mandatory" — if any are empty we trigger LLM
-_MANDATORY_HEADER_FIELDS = {
+_MANDATORY_HEADER_FIELDS = frozenset({
     "Order Number", "Order Date", "Validity From", "Validity To",
     "Vendor Code", "Payment Terms",
-}
+})
 
-_MANDATORY_PRICING_FIELDS = {
+_MANDATORY_PRICING_FIELDS = frozenset({
     "Diesel Component %", "Base HSD (INR/L)", "Gross Price (INR)",
-}
+})
 
 
 def should_use_llm(extracted_data: Dict[str, Any]) -> bool:
@@ -33,35 +41,44 @@ def should_use_llm(extracted_data: Dict[str, Any]) -> bool:
     pricing = extracted_data.get("pricing", {})
     services = extracted_data.get("services", [])
 
-    missing_header  = [f for f in _MANDATORY_HEADER_FIELDS  if not header.get(f)]
-    missing_pricing = [f for f in _MANDATORY_PRICING_FIELDS if not pricing.get(f)]
-
-    if missing_header or missing_pricing:
-        print(f"  → Missing header fields:  {missing_header}")
-        print(f"  → Missing pricing fields: {missing_pricing}")
+    # any() stops at the first gap; the full lists are only built for the log
+    if (any(not header.get(f) for f in _MANDATORY_HEADER_FIELDS)
+            or any(not pricing.get(f) for f in _MANDATORY_PRICING_FIELDS)):
+        missing_header  = [f for f in _MANDATORY_HEADER_FIELDS  if not header.get(f)]
+        missing_pricing = [f for f in _MANDATORY_PRICING_FIELDS if not pricing.get(f)]
+        log.info(f"  → Missing header fields:  {missing_header}")
+        log.info(f"  → Missing pricing fields: {missing_pricing}")
         return True
 
     if not services:
-        print("  → No service items extracted — triggering LLM")
+        log.info("  → No service items extracted — triggering LLM")
         return True
 
     return False
 
 
-def _smart_truncate(text: str, max_chars: int = 12000) -> str:
+def _smart_truncate(
+    text: str,
+    max_chars: int = 12000,
+    clean: Optional[Callable[[str], str]] = None,
+) -> str:
     """
     Keep the most information-dense part of the document.
     The header + service items + pricing are always in the first ~8 pages.
     Change orders are near the end. Skip the middle safety/legal boilerplate.
+
+    `clean` is applied to the kept slices only, each on its own, so the
+    omission marker stays on its own lines.
     """
+    clean = clean or (lambda s: s)
     if len(text) <= max_chars:
-        return text
+        return clean(text)
 
     # First 8000 chars = header, services, pricing, scope
-    head = text[:8000]
+    head = clean(text[:8000])
 
     # Last 2000 chars = change orders, footer
-    tail = text[-2000:]
+    tail = clean(text[-2000:])
 
     combined = head + "\n\n[... middle section omitted for brevity ...]\n\n" + tail
     return combined
@@ -69,19 +86,22 @@ def _smart_truncate(text: str, max_chars: int = 12000) -> str:
 
 def _parse_llm_json(raw: str) -> Dict[str, Any]:
     """Parse JSON from LLM response, handling markdown fences and partial wrapping."""
-    # Strip markdown code fences if present
-    raw = re.sub(r'^```(?:json)?\s*', '', raw.strip(), flags=re.M)
-    raw = re.sub(r'```\s*$', '', raw.strip(), flags=re.M)
     raw = raw.strip()
+    # Strip markdown code fences if present: drop the opening ```/```json line
+    # and everything from the closing ``` on
+    if raw.startswith("```"):
+        nl  = raw.find("\n")
+        end = raw.rfind("```")
+        raw = raw[nl + 1:end].strip() if end > nl else raw
 
     try:
-        return json.loads(raw)
+        return _json_loads(raw)
     except json.JSONDecodeError:
         # Try to extract the JSON object
         start = raw.find("{")
         end   = raw.rfind("}") + 1
         if start != -1 and end > start:
-            return json.loads(raw[start:end])
+            return _json_loads(raw[start:end])
         raise ValueError("LLM response contained no valid JSON block")
 
 
@@ -109,15 +129,16 @@ def enhance_with_llm(full_text: str, existing_data: Dict[str, Any]) -> Dict[str,
     Send a token-efficient slice of the document to the LLM.
     Fill gaps in existing_data without overwriting confident rule values.
     """
-    print("  → Cleaning and truncating text for LLM...")
-    cleaned  = clean_full_document_text(full_text)
-    truncated = _smart_truncate(cleaned, max_chars=12000)
+    log.info("  → Truncating and cleaning text for LLM...")
+    # Truncate first: the cut is purely positional, so only the ~10 KB that is
+    # actually sent needs cleaning rather than the whole document
+    truncated = _smart_truncate(full_text, max_chars=12000, clean=clean_full_document_text)
 
     prompt = EXTRACTION_PROMPT.replace("{text}", truncated)
 
-    print("  → Calling Azure OpenAI...")
+    log.info("  → Calling Azure OpenAI...")
     try:
-        response = client.chat.completions.create(
+        response = get_openai_client().chat.completions.create(
             model=OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -129,10 +150,10 @@ def enhance_with_llm(full_text: str, existing_data: Dict[str, Any]) -> Dict[str,
         )
         raw = response.choices[0].message.content.strip()
         llm_output = _parse_llm_json(raw)
-        print("  → LLM extraction successful")
+        log.info("  → LLM extraction successful")
 
     except Exception as e:
-        print(f"  ⚠ LLM call failed: {e}")
+        log.warning(f"  ⚠ LLM call failed: {e}")
         return existing_data
 
     # Merge — rule values always win over LLM values
@@ -1,6 +1,6 @@
 # src/pdf_extractor.py
 """
-Direct PDF text extraction using pypdf.
+Direct PDF text extraction using PyMuPDF when installed, else pypdf.
 
 WHY THIS EXISTS
 ---------------
@@ -9,16 +9,35 @@ For this 51-page work order PDF, DI only covers pages 1-2. All C/O notes,
 exit clauses, safety norms, ceiling values live on pages 3-51 and were invisible.
 
 THE FIX: extract text directly from PDF with pypdf (free, instant, no quota).
+PyMuPDF (optional) does the same in C and is ~9x faster on the sample; its
+words are regrouped into visual rows so the rule extractor sees pypdf-style lines.
 
 TWO-COLUMN NOTE
 ---------------
 Page 1 has a two-column layout. pypdf reads left-column labels first, then
-right-column values. resolve_two_column_headers() pairs them up by position.
+right-column values. resolve_two_column_headers() pairs them up by position;
+extract_text_from_pdf() returns the result alongside the text.
 """
 
+import logging
 import re
+import threading
+from io import BytesIO
+from itertools import filterfalse
+from typing import Tuple
 from pypdf import PdfReader
 
+log = logging.getLogger(__name__)
+
+try:  # optional — C-backed and much faster than pypdf on long work orders
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+# PyMuPDF does not support being used from several threads at once, and
+# process_folder runs PDFs in a pool — one document is parsed at a time
+_mupdf_lock = threading.Lock()
+
 # Noise lines that repeat on every "Order Continuation Sheet" page
 # FIX: only strip "Order No. Test Contract Number" — NOT bare "Order No."
 # (bare "Order No." is a real label on page 1 and was being incorrectly stripped)
@@ -27,7 +46,18 @@ _NOISE_PATTERNS = [
     r'^Order\s+No\.?\s+Test\s+(?:Contract\s+Number|Order\s+No\.?)\s*$',
     r'^Page\s*:\s*\d+\s+of\s+\d+\s*$',
 ]
-_NOISE_RE = re.compile('|'.join(_NOISE_PATTERNS), re.I | re.M)
+# Matched per raw page line, before whitespace is normalised — so no re.A:
+# "Page\xa0:\xa03 of 5" must still count as noise
+_NOISE_RE = re.compile('|'.join(_NOISE_PATTERNS), re.I)
+
+
+def _is_noise(line: str) -> bool:
+    """Every noise line starts with "Order" or "Page" — skip the regex for the rest."""
+    # The first-character gate rejects ~87% of lines. A startswith() cascade
+    # or per-prefix regexes measured slower than letting _NOISE_RE confirm,
+    # and startswith() would lose the case-insensitive whole-line match.
+    return line[0] in 'OoPp' and _NOISE_RE.match(line) is not None
+
 
 # Two-column header labels on page 1
 _TWO_COL_LABELS = {
@@ -38,66 +68,99 @@ _TWO_COL_LABELS = {
     'E-Mail'        : 'Contact Email',
 }
 
-_last_two_col_headers: dict = {}
-
 
 def resolve_two_column_headers(lines: list) -> dict:
     """Pair up two-column label/value lines from page 1."""
     result = {}
-    i = 0
-    while i < len(lines):
-        if lines[i] in _TWO_COL_LABELS:
-            labels = []
-            while i < len(lines) and lines[i] in _TWO_COL_LABELS:
-                labels.append(lines[i])
-                i += 1
-            values = []
-            while i < len(lines) and re.match(r'^:-', lines[i]):
-                val = re.sub(r'^:-\s*', '', lines[i]).strip()
-                values.append(val)
-                i += 1
-            for label, value in zip(labels, values):
+    labels = []  # current run of labels
+    n = 0        # ":-" values seen since the run ended
+    for line in lines:
+        if line in _TWO_COL_LABELS:
+            if n:  # a label after values opens a new run
+                labels, n = [], 0
+            labels.append(line)
+        elif labels and line.startswith(':-'):
+            if n < len(labels):
+                value = line[2:].strip()
                 if value:
-                    result[_TWO_COL_LABELS[label]] = value
+                    result[_TWO_COL_LABELS[labels[n]]] = value
+            n += 1
         else:
-            i += 1
+            labels, n = [], 0
     return result
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract all text from PDF, pipe-separated by paragraph."""
-    global _last_two_col_headers
-    _last_two_col_headers = {}
+def _mupdf_page_text(page) -> str:
+    """Rebuild a PyMuPDF page as visual rows, the way pypdf lays them out."""
+    lines = {}
+    for x0, _y0, _x1, y1, word, block, line, _n in page.get_text("words"):
+        entry = lines.get((block, line))
+        if entry is None:
+            lines[(block, line)] = [y1, x0, [word]]
+        else:
+            entry[2].append(word)
 
-    reader = PdfReader(pdf_path)
-    n_pages = len(reader.pages)
+    # Lines sharing a baseline (within 3pt) are one visual row, left to right
+    rows = []
+    for y1, x0, words in sorted(lines.values(), key=lambda e: (e[0], e[1])):
+        if rows and y1 - rows[-1][0] <= 3:
+            rows[-1][1].append((x0, words))
+        else:
+            rows.append([y1, [(x0, words)]])
+    return '\n'.join(
+        ' '.join(w for _, words in sorted(segs, key=lambda s: s[0]) for w in words)
+        for _, segs in rows
+    )
+
+
+def text_backend() -> str:
+    """Name of the library extract_text_from_pdf() reads pages with."""
+    return "PyMuPDF" if pymupdf is not None else "pypdf"
+
+
+def _read_pages(pdf_path: str) -> list:
+    """Raw text of every page, via PyMuPDF if available, else pypdf."""
+    # One read up front — both parsers seek around the file a lot
+    with open(pdf_path, 'rb') as f:
+        data = f.read()
+    if pymupdf is not None:
+        with _mupdf_lock, pymupdf.open(stream=data, filetype="pdf") as doc:
+            return [_mupdf_page_text(page) for page in doc]
+    # Plain mode (pypdf's default) — no layout pass. What's left is content-stream
+    # parsing and Tj decoding, ~0.8 s on the sample; a bare Tj walker would save
+    # little and lose the line breaks _is_noise and the two-column resolver need.
+    return [
+        page.extract_text(extraction_mode="plain") or ""
+        for page in PdfReader(BytesIO(data)).pages
+    ]
+
+
+def extract_text_from_pdf(pdf_path: str) -> Tuple[str, dict]:
+    """
+    Extract all text from PDF, pipe-separated by paragraph.
+    Returns (full_text, two_col_headers) — the latter resolved from page 1.
+    """
+    two_col: dict = {}
+    raw_pages = _read_pages(pdf_path)
+    n_pages = len(raw_pages)
     pages_text = []
 
-    for i, page in enumerate(reader.pages):
-        raw = page.extract_text() or ""
+    for i, raw in enumerate(raw_pages):
         if not raw.strip():
             continue
 
-        lines = []
-        for line in raw.split('\n'):
-            line = line.strip()
-            if line and not _NOISE_RE.match(line):
-                lines.append(line)
+        # strip → drop blanks → drop noise, all driven from C iterators
+        lines = list(filterfalse(_is_noise, filter(None, map(str.strip, raw.split('\n')))))
 
         if i == 0:
-            _last_two_col_headers = resolve_two_column_headers(lines)
+            two_col = resolve_two_column_headers(lines)
 
         page_text = ' | '.join(lines)
         if page_text.strip():
             pages_text.append(page_text)
 
     full_text = ' | '.join(pages_text)
-    full_text = re.sub(r'\s{2,}', ' ', full_text)
-
-    print(f"  PDF: {n_pages} pages → {len(full_text):,} chars ({len(full_text.split()):,} words)")
-    return full_text
-
+    full_text = ' '.join(full_text.split())
 
-def get_two_col_headers() -> dict:
-    """Return header fields resolved from page 1 two-column layout."""
-    return _last_two_col_headers
\ No newline at end of file
+    log.info(f"  PDF: {n_pages} pages → {len(full_text):,} chars ({len(full_text.split()):,} words)")
+    return full_text, two_col
\ No newline at end of file